@@ -81,6 +81,12 @@ resource "azurerm_storage_container" "uploads" {
   container_access_type = "private"
 }
 
+resource "azurerm_storage_container" "manifests" {
+  name                  = "manifests"
+  storage_account_id    = azurerm_storage_account.main.id
+  container_access_type = "private"
+}
+
 resource "azurerm_application_insights" "main" {
   name                = "${local.base_name}-appi"
   location            = azurerm_resource_group.main.location
@@ -130,6 +136,8 @@ resource "azurerm_linux_function_app" "analyzer" {
     CONFIG_JSON                           = "@Microsoft.KeyVault(SecretUri=${azurerm_key_vault_secret.config_json.secret_uri_with_version})"
     AZURE_COMMUNICATION_CONNECTION_STRING = "@Microsoft.KeyVault(SecretUri=${azurerm_key_vault_secret.communication_connection.secret_uri_with_version})"
     EMAIL_SENDER_ADDRESS                  = "@Microsoft.KeyVault(SecretUri=${azurerm_key_vault_secret.communication_sender.secret_uri_with_version})"
+    STORAGE_ACCOUNT_NAME                  = azurerm_storage_account.main.name
+    MANIFEST_CONTAINER_NAME               = azurerm_storage_container.manifests.name
     APPINSIGHTS_INSTRUMENTATIONKEY        = azurerm_application_insights.main.instrumentation_key
     APPLICATIONINSIGHTS_CONNECTION_STRING = azurerm_application_insights.main.connection_string
     AzureWebJobsStorage__credential       = "managedidentity"
@@ -171,6 +179,7 @@ resource "azurerm_linux_web_app" "uploader" {
     SCM_DO_BUILD_DURING_DEPLOYMENT        = "1"
     STORAGE_ACCOUNT_NAME                  = azurerm_storage_account.main.name
     UPLOAD_CONTAINER_NAME                 = azurerm_storage_container.uploads.name
+    MANIFEST_CONTAINER_NAME               = azurerm_storage_container.manifests.name
     AUTHORIZED_USER_EMAILS                = var.authorized_user_emails
     APPINSIGHTS_INSTRUMENTATIONKEY        = azurerm_application_insights.main.instrumentation_key
     APPLICATIONINSIGHTS_CONNECTION_STRING = azurerm_application_insights.main.connection_string
@@ -0,0 +1,98 @@
+"""Compare cold per-job summarization against the warm summarization service."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FUNCTION_APP_DIR = REPO_ROOT / "src" / "function_app"
+sys.path.insert(0, str(FUNCTION_APP_DIR))
+
+from shared_code import summary_service  # noqa: E402  pylint: disable=wrong-import-position
+
+CONFIG = {
+    "Categories": ["Dining & Drinks", "Groceries", "Bills & Utilities"],
+    "People": [
+        {"Name": "Alice", "Accounts": [1111], "Email": "alice@example.com"},
+        {"Name": "Bob", "Accounts": [2222], "Email": "bob@example.com"},
+    ],
+}
+
+COLD_SNIPPET = """\
+import json, os, sys
+sys.path.insert(0, sys.argv[1])
+from shared_code import summarizer
+summarizer.summarize(sys.argv[2], json.loads(os.environ["CONFIG_JSON"]))
+"""
+
+
+def _generate_csv(rows: int) -> bytes:
+    rng = random.Random(0)
+    categories = [*CONFIG["Categories"], "Travel"]
+    lines = ["Date,Category,Account Number,Amount,Ignored From"]
+    for _ in range(rows):
+        lines.append(
+            f"2024-01-{rng.randint(1, 28):02d},{rng.choice(categories)},"
+            f"{rng.choice([1111, 2222])},{rng.uniform(1, 200):.2f},"
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _time_cold(csv_path: str, jobs: int) -> float:
+    env = {**os.environ, "CONFIG_JSON": json.dumps(CONFIG)}
+    start = time.perf_counter()
+    for _ in range(jobs):
+        subprocess.run(
+            [sys.executable, "-c", COLD_SNIPPET, str(FUNCTION_APP_DIR), csv_path],
+            check=True,
+            env=env,
+        )
+    return time.perf_counter() - start
+
+
+def _time_warm(payload: bytes, socket_path: str, jobs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(jobs):
+        summary_service.summarize_remote(payload, socket_path, CONFIG)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    payload = _generate_csv(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "transactions.csv")
+        Path(csv_path).write_bytes(payload)
+        socket_path = os.path.join(tmp_dir, "summary.sock")
+
+        server = summary_service.SummaryServer(socket_path, CONFIG, args.workers)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            cold = _time_cold(csv_path, args.jobs)
+            warm = _time_warm(payload, socket_path, args.jobs)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"rows={args.rows} jobs={args.jobs}")
+    print(f"cold: {cold / args.jobs * 1000:8.1f} ms/job")
+    print(f"warm: {warm / args.jobs * 1000:8.1f} ms/job")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Copy the upload manifest writer from the function app into the web app."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SOURCE_FILE = REPO_ROOT / "src" / "function_app" / "shared_code" / "upload_manifest.py"
+OUTPUT_FILE = REPO_ROOT / "src" / "webapp" / "manifest_writer.py"
+
+
+def render_manifest_writer() -> str:
+    """Return the web app copy of the manifest writer module."""
+    header = [
+        "# Auto-generated by scripts/sync_manifest_writer.py",
+        "# Source: src/function_app/shared_code/upload_manifest.py (edit that file instead)",
+        "",
+    ]
+    return "\n".join(header) + SOURCE_FILE.read_text()
+
+
+def main() -> None:
+    OUTPUT_FILE.write_text(render_manifest_writer())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,21 @@
 """Azure Function entrypoint triggered by a blob upload."""
 
 # Standard library imports
+import datetime as dt
 import json
 import logging
 import os
 from io import BytesIO
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Third-party imports
 import azure.functions as func
 from azure.communication.email import EmailClient
+from azure.core.exceptions import AzureError
+from azure.identity import DefaultAzureCredential
+from azure.storage.blob import BlobServiceClient
 
-from shared_code import summarizer
+from shared_code import sharding, summarizer, summary_service, upload_manifest
 
 
 def _load_config() -> dict:
@@ -78,6 +82,76 @@ def _get_config() -> dict:
     return _CONFIG_CACHE
 
 
+_MANIFEST_WRITER: Optional[upload_manifest.ManifestWriter] = None
+
+
+def _get_manifest_writer() -> upload_manifest.ManifestWriter:
+    global _MANIFEST_WRITER  # pylint: disable=global-statement
+    if _MANIFEST_WRITER is not None:
+        return _MANIFEST_WRITER
+
+    connection_string = os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
+    if connection_string:
+        service = BlobServiceClient.from_connection_string(connection_string)
+    else:
+        account_name = os.getenv("STORAGE_ACCOUNT_NAME")
+        if not account_name:
+            raise RuntimeError(
+                "STORAGE_ACCOUNT_NAME or STORAGE_ACCOUNT_CONNECTION_STRING must be configured."
+            )
+        credential = DefaultAzureCredential(exclude_interactive_browser_credential=True)
+        service = BlobServiceClient(
+            account_url=f"https://{account_name}.blob.core.windows.net",
+            credential=credential,
+        )
+
+    _MANIFEST_WRITER = upload_manifest.ManifestWriter(
+        service.get_container_client(os.getenv("MANIFEST_CONTAINER_NAME", "manifests"))
+    )
+    return _MANIFEST_WRITER
+
+
+def _record_manifest_event(event: Dict[str, Any]) -> None:
+    """Append a status event to the upload manifest without failing the run."""
+    try:
+        _get_manifest_writer().append(event)
+    except (AzureError, RuntimeError):
+        logging.warning("Failed to update upload manifest", exc_info=True)
+
+
+def _get_shard_workers() -> int:
+    raw_workers = os.getenv("SUMMARY_SHARD_WORKERS", "")
+    if not raw_workers:
+        return 0
+    try:
+        return int(raw_workers)
+    except ValueError as exc:
+        raise RuntimeError("SUMMARY_SHARD_WORKERS must be an integer.") from exc
+
+
+def _summarize(payload: bytes) -> summarizer.SummaryResult:
+    """Summarize via the warm service when configured, otherwise in-process.
+
+    In-process runs are serial unless ``SUMMARY_SHARD_WORKERS`` opts large
+    exports into sharding across that many worker processes.
+    """
+    config = _get_config()
+    socket_path = os.getenv("SUMMARY_SERVICE_SOCKET")
+    if socket_path:
+        try:
+            return summary_service.summarize_remote(payload, socket_path, config)
+        except summary_service.SummaryServiceUnavailable:
+            logging.warning(
+                "Summary service at %s could not take the job; summarizing in-process",
+                socket_path,
+                exc_info=True,
+            )
+    workers = _get_shard_workers()
+    if workers > 1:
+        return sharding.summarize_sharded(payload, config, workers=workers)
+    return summarizer.summarize(BytesIO(payload), config)
+
+
 def main(blob: func.InputStream) -> None:
     """Generate a summary from an uploaded blob and email it to configured recipients."""
     logging.info(
@@ -86,10 +160,32 @@ def main(blob: func.InputStream) -> None:
         blob.length or 0,
     )
 
-    payload = blob.read()
-    buffer = BytesIO(payload)
+    # The trigger reports "<container>/<blob name>"; the manifest is keyed by blob name.
+    blob_name = (blob.name or "").split("/", 1)[-1]
 
-    config = _get_config()
-    destinations, subject, html = summarizer.build_summary(buffer, config)
-    _send_summary_email(destinations, subject, html)
-    logging.info("Summary email sent to: %s", ", ".join(destinations))
+    try:
+        payload = blob.read()
+        result = _summarize(payload)
+        _send_summary_email(result.destinations, result.subject, result.html)
+    except Exception as exc:
+        _record_manifest_event(
+            {
+                "event": upload_manifest.EVENT_FAILED,
+                "blob": blob_name,
+                "processed_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "error": str(exc)[:500],
+            }
+        )
+        raise
+
+    logging.info("Summary email sent to: %s", ", ".join(result.destinations))
+    _record_manifest_event(
+        {
+            "event": upload_manifest.EVENT_PROCESSED,
+            "blob": blob_name,
+            "processed_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "row_count": result.row_count,
+            "totals": result.totals,
+            "subject": result.subject,
+        }
+    )
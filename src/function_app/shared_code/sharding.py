@@ -0,0 +1,248 @@
+"""Parallel summarization of large CSV exports split into byte-range shards.
+
+The export is cut into contiguous byte ranges that end on record boundaries
+(newlines outside quoted fields). Each shard is parsed in a separate process,
+which is where nearly all of the time goes, and reduced to its row count, date
+bounds and the (Category, Account Number, Amount) rows that pass the summary
+filter. The parent concatenates those rows in file order and runs the same
+pivot as the serial path, so the output is identical to ``summarizer.summarize``
+rather than merely close: merging floating-point partial sums per shard would
+round differently from pandas' single compensated sum.
+
+The payload is copied once into shared memory and each worker receives only
+byte offsets into it, so shards are not pickled to the workers. Workers come
+from a long-lived pool started by a forkserver that preloads pandas; forking
+the multi-threaded Functions host directly is unsafe.
+
+Shards parse dates with the format the serial path would infer from the first
+date in the file. Whenever the shards could disagree with a whole-file parse
+(a shard infers a non-numeric column, or a shard fails to parse), the export
+is summarized serially instead.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd  # pylint: disable=import-error
+from pandas.api.types import is_numeric_dtype, is_string_dtype  # pylint: disable=import-error
+from pandas.tseries.api import guess_datetime_format  # pylint: disable=import-error
+
+from shared_code import summarizer
+
+DEFAULT_MIN_SHARD_BYTES = 4 * 1024 * 1024
+
+_SHARD_COLUMNS = ["Category", "Account Number", "Amount"]
+_FORKSERVER_PRELOAD = ["pandas", "shared_code.summarizer", "shared_code.sharding"]
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_WORKERS = 0
+_EXECUTOR_LOCK = threading.Lock()
+
+
+@dataclass
+class ShardSummary:
+    """Per-shard reduction returned by worker processes."""
+
+    rows: pd.DataFrame
+    row_count: int
+    min_date: Optional[pd.Timestamp]
+    max_date: Optional[pd.Timestamp]
+
+
+def _available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use."""
+    global _EXECUTOR, _EXECUTOR_WORKERS  # pylint: disable=global-statement
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(_FORKSERVER_PRELOAD)
+            _EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR
+
+
+def _discard_executor(executor: Executor) -> None:
+    """Drop the shared pool after a failure so the next call starts a fresh one."""
+    global _EXECUTOR  # pylint: disable=global-statement
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is executor:
+            _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            _EXECUTOR = None
+
+
+def _next_record_end(data: bytes, position: int, in_quotes: bool) -> Tuple[int, bool]:
+    """Return the offset just past the next unquoted newline at or after ``position``.
+
+    ``in_quotes`` is the quote state at ``position``. A doubled quote inside a
+    quoted field toggles the state twice, so counting quote characters is
+    enough to track whether a newline terminates a record.
+    """
+    while True:
+        newline = data.find(b"\n", position)
+        if newline == -1:
+            return len(data), in_quotes
+        if data.count(b'"', position, newline) % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            return newline + 1, in_quotes
+        position = newline + 1
+
+
+def split_csv(data: bytes, shards: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """Split CSV bytes into a header and up to ``shards`` record-aligned ranges."""
+    header_end, _ = _next_record_end(data, 0, False)
+    header = data[:header_end]
+    body_size = len(data) - header_end
+    shards = max(1, min(shards, body_size))
+
+    ranges: List[Tuple[int, int]] = []
+    start = header_end
+    for index in range(1, shards + 1):
+        if start >= len(data):
+            break
+        target = header_end + body_size * index // shards
+        if index == shards:
+            end = len(data)
+        elif target <= start:
+            continue
+        else:
+            # Every range starts on a record boundary, so the quote state at
+            # ``target`` is the parity of the quotes skipped to reach it.
+            in_quotes = data.count(b'"', start, target) % 2 == 1
+            end, _ = _next_record_end(data, target, in_quotes)
+        if end > start:
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _infer_date_format(data: bytes, sample_rows: int = 1000) -> Optional[str]:
+    """Return the format ``pd.to_datetime`` would infer for the whole export."""
+    sample = pd.read_csv(BytesIO(data), usecols=["Date"], nrows=sample_rows)["Date"]
+    sample = sample.dropna()
+    if sample.empty or not is_string_dtype(sample):
+        return None
+    return guess_datetime_format(str(sample.iloc[0]))
+
+
+def summarize_shard(
+    buffer_name: str,
+    header_end: int,
+    start: int,
+    end: int,
+    config: Dict[str, Iterable],
+    date_format: str,
+) -> ShardSummary:
+    """Parse one shard of the shared buffer and reduce it for the merge."""
+    shared = SharedMemory(name=buffer_name)
+    try:
+        shard_csv = BytesIO(bytes(shared.buf[:header_end]) + bytes(shared.buf[start:end]))
+    finally:
+        shared.close()
+
+    df = pd.read_csv(shard_csv)
+    dates = pd.to_datetime(df["Date"], format=date_format)
+    rows = summarizer.filter_transactions(df, config)[_SHARD_COLUMNS]
+    return ShardSummary(
+        rows=rows,
+        row_count=len(df),
+        min_date=dates.min() if len(df) else None,
+        max_date=dates.max() if len(df) else None,
+    )
+
+
+def _shards_consistent(shards: List[ShardSummary]) -> bool:
+    """Return whether per-shard dtype inference matches a whole-file parse."""
+    for shard in shards:
+        if not shard.row_count:
+            continue
+        for column in ("Account Number", "Amount"):
+            if not is_numeric_dtype(shard.rows[column]):
+                return False
+    return True
+
+
+def merge_shards(
+    shards: List[ShardSummary], config: Dict[str, Iterable]
+) -> summarizer.SummaryResult:
+    """Combine per-shard reductions (in file order) into the final summary."""
+    rows = pd.concat([shard.rows for shard in shards], ignore_index=True)
+    summary_df = summarizer.pivot_totals(rows, config)
+
+    populated = [shard for shard in shards if shard.row_count]
+    min_date = pd.Series([shard.min_date for shard in populated]).min()
+    max_date = pd.Series([shard.max_date for shard in populated]).max()
+    row_count = sum(shard.row_count for shard in shards)
+    return summarizer.build_result(summary_df, config, row_count, min_date, max_date)
+
+
+def summarize_sharded(
+    data: bytes,
+    config: Dict[str, Iterable],
+    workers: Optional[int] = None,
+    min_shard_bytes: int = DEFAULT_MIN_SHARD_BYTES,
+    executor: Optional[Executor] = None,
+) -> summarizer.SummaryResult:
+    """Summarize CSV bytes using a process pool, matching ``summarizer.summarize``.
+
+    Inputs too small to give every worker ``min_shard_bytes`` fall back to the
+    serial path, since process start-up would outweigh the parsing saved.
+    """
+    workers = workers or _available_cpus()
+    shard_count = min(workers, len(data) // max(min_shard_bytes, 1))
+    if shard_count <= 1:
+        return summarizer.summarize(BytesIO(data), config)
+
+    header, ranges = split_csv(data, shard_count)
+    if len(ranges) <= 1:
+        return summarizer.summarize(BytesIO(data), config)
+
+    try:
+        date_format = _infer_date_format(data)
+    except Exception:  # pylint: disable=broad-except
+        # e.g. no Date column; the serial path raises its own error for this export.
+        date_format = None
+    if date_format is None:
+        return summarizer.summarize(BytesIO(data), config)
+
+    shared = SharedMemory(create=True, size=len(data))
+    try:
+        shared.buf[: len(data)] = data
+        arguments = (
+            [shared.name] * len(ranges),
+            [len(header)] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            [config] * len(ranges),
+            [date_format] * len(ranges),
+        )
+        pool = executor if executor is not None else _get_executor(workers)
+        try:
+            shards = list(pool.map(summarize_shard, *arguments))
+        except Exception:  # pylint: disable=broad-except
+            # Let the serial path produce its own result or error for this export.
+            _discard_executor(pool)
+            return summarizer.summarize(BytesIO(data), config)
+    finally:
+        shared.close()
+        shared.unlink()
+
+    if not _shards_consistent(shards):
+        return summarizer.summarize(BytesIO(data), config)
+    return merge_shards(shards, config)
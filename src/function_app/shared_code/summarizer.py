@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, IO, List, Tuple, Union
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, IO, List, Optional, Tuple, Union
 
 import html
 import os
@@ -23,12 +24,15 @@ def _build_owners_dict(config: Dict[str, Iterable]) -> Dict[str, Dict[int, str]]
     return owners_dict
 
 
-def build_summary_df(df: pd.DataFrame, config: Dict[str, Iterable]) -> pd.DataFrame:
-    """Return pivot table of totals per owner/category."""
-    owners_df = pd.DataFrame(_build_owners_dict(config))
+def filter_transactions(df: pd.DataFrame, config: Dict[str, Iterable]) -> pd.DataFrame:
+    """Return the rows that count toward the summary (not ignored, configured category)."""
     categories = config.get("Categories", [])
+    return df[df["Ignored From"].isnull() & df["Category"].isin(categories)]
+
 
-    df_filtered = df[df["Ignored From"].isnull() & df["Category"].isin(categories)]
+def pivot_totals(df_filtered: pd.DataFrame, config: Dict[str, Iterable]) -> pd.DataFrame:
+    """Return pivot table of totals per owner/category from already-filtered rows."""
+    owners_df = pd.DataFrame(_build_owners_dict(config))
     df_merged = pd.merge(df_filtered, owners_df, how="left", on="Account Number")
     df_agg = df_merged.groupby(["Category", "Owner"])[["Amount"]].sum().reset_index()
     df_pivot = (
@@ -39,6 +43,11 @@ def build_summary_df(df: pd.DataFrame, config: Dict[str, Iterable]) -> pd.DataFr
     return df_pivot
 
 
+def build_summary_df(df: pd.DataFrame, config: Dict[str, Iterable]) -> pd.DataFrame:
+    """Return pivot table of totals per owner/category."""
+    return pivot_totals(filter_transactions(df, config), config)
+
+
 def _to_money(value: float) -> str:
     """Format a numeric value as currency string."""
     return f"{value:.2f}"
@@ -162,21 +171,32 @@ def write_email_body(
     return body
 
 
-def build_summary(path: CsvInput, config: Dict[str, Iterable]) -> Tuple[List[str], str, str]:
-    """Build email payload (destinations, subject, html) from CSV input."""
-    df = pd.read_csv(path)
-    df["Date"] = pd.to_datetime(df["Date"])
+@dataclass
+class SummaryResult:
+    """Email payload plus the statistics recorded in the upload manifest."""
 
-    summary_df = build_summary_df(df, config)
+    destinations: List[str]
+    subject: str
+    html: str
+    row_count: int = 0
+    totals: Dict[str, float] = field(default_factory=dict)
+
+
+def build_result(
+    summary_df: pd.DataFrame,
+    config: Dict[str, Iterable],
+    row_count: int,
+    min_date: Optional[pd.Timestamp],
+    max_date: Optional[pd.Timestamp],
+) -> SummaryResult:
+    """Assemble the email payload from the pivot table and export statistics."""
     totals = summary_df.sum(axis=1)
     totals.name = "Total"
     html_body = write_email_body(summary_df, totals, config)
 
     date_range = ""
-    if not df["Date"].empty:
-        min_date = df["Date"].min().strftime("%m/%d")
-        max_date = df["Date"].max().strftime("%m/%d")
-        date_range = f": {min_date} - {max_date}"
+    if row_count:
+        date_range = f": {min_date.strftime('%m/%d')} - {max_date.strftime('%m/%d')}"
 
     subject = f"Transactions Summary{date_range}"
     destinations = [
@@ -184,4 +204,27 @@ def build_summary(path: CsvInput, config: Dict[str, Iterable]) -> Tuple[List[str
         for person in config.get("People", [])
         if person.get("Email")
     ]
-    return destinations, subject, html_body
+    return SummaryResult(
+        destinations=destinations,
+        subject=subject,
+        html=html_body,
+        row_count=row_count,
+        totals={str(owner): round(float(amount), 2) for owner, amount in totals.items()},
+    )
+
+
+def summarize(path: CsvInput, config: Dict[str, Iterable]) -> SummaryResult:
+    """Build the summary payload and statistics from CSV input."""
+    df = pd.read_csv(path)
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    summary_df = build_summary_df(df, config)
+    return build_result(
+        summary_df, config, len(df), df["Date"].min(), df["Date"].max()
+    )
+
+
+def build_summary(path: CsvInput, config: Dict[str, Iterable]) -> Tuple[List[str], str, str]:
+    """Build email payload (destinations, subject, html) from CSV input."""
+    result = summarize(path, config)
+    return result.destinations, result.subject, result.html
@@ -0,0 +1,342 @@
+"""Long-lived summarization service backed by a pool of pre-warmed workers.
+
+Each worker process is started once, from a forkserver that has already
+imported pandas and the summarizer, and initialized with the Rocket Money
+configuration already parsed, so individual jobs skip interpreter startup,
+imports and config parsing. Forking from the single-threaded forkserver rather
+than the multi-threaded server keeps pool restarts safe. Jobs arrive over a local Unix socket as
+length-prefixed frames: a JSON header carrying the caller's config fingerprint,
+then the raw CSV export. The response is a JSON document containing the
+``SummaryResult`` fields or an error. A job whose fingerprint does not match
+the config the service loaded is rejected so the caller can summarize
+in-process with its current config instead of a stale one.
+
+Run locally with::
+
+    python -m shared_code.summary_service --socket /tmp/rm-summary.sock
+
+and point callers at it through the ``SUMMARY_SERVICE_SOCKET`` setting.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Dict, Iterable, Optional
+
+from shared_code import summarizer
+
+_HEADER = struct.Struct("!I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+_WORKER_CONFIG: Optional[Dict[str, Iterable]] = None
+
+
+ERROR_CONFIG_MISMATCH = "config_mismatch"
+ERROR_WORKER_LOST = "worker_lost"
+ERROR_JOB_FAILED = "job_failed"
+
+_FORKSERVER_PRELOAD = ["pandas", "shared_code.summarizer"]
+
+
+class SummaryServiceError(RuntimeError):
+    """Raised when the service reports that a job failed.
+
+    The message is ``str()`` of the worker's exception, matching what an
+    in-process failure would report; ``error_type`` holds its class name.
+    """
+
+    def __init__(self, message: str, error_type: str = "") -> None:
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class SummaryServiceUnavailable(RuntimeError):
+    """Raised when a job could not be handled by the service at all.
+
+    Covers connection and protocol failures, payloads over the frame limit,
+    config mismatches and jobs lost to a dying worker (which fails every job
+    in flight on the pool, not only the one that caused it); callers should
+    summarize in-process instead.
+    """
+
+
+def config_fingerprint(config: Dict[str, Iterable]) -> str:
+    """Return a stable hash of the canonical JSON form of ``config``."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly ``size`` bytes or raise if the peer closes early."""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Connection closed before frame was complete.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    """Write a length-prefixed frame."""
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_BYTES}.")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    """Read a length-prefixed frame."""
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_BYTES}.")
+    return _recv_exact(sock, size)
+
+
+def _init_worker(config: Dict[str, Iterable]) -> None:
+    """Store the parsed config in the worker and warm up the pandas code paths."""
+    global _WORKER_CONFIG  # pylint: disable=global-statement
+    # Ctrl+C reaches the whole process group; let the parent tear the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _WORKER_CONFIG = config
+    warmup_csv = b"Date,Category,Account Number,Amount,Ignored From\n"
+    try:
+        summarizer.summarize(BytesIO(warmup_csv), config)
+    except Exception:  # pylint: disable=broad-except
+        logging.debug("Summary worker warm-up failed", exc_info=True)
+
+
+def _noop() -> None:
+    """Trivial job used to force the pool to start its workers."""
+
+
+def _run_job(payload: bytes) -> Dict[str, Any]:
+    """Summarize one CSV payload inside a worker process."""
+    if _WORKER_CONFIG is None:
+        raise RuntimeError("Summary worker was not initialized with a config.")
+    result = summarizer.summarize(BytesIO(payload), _WORKER_CONFIG)
+    return dataclasses.asdict(result)
+
+
+class _JobHandler(socketserver.BaseRequestHandler):
+    """Handle one connection carrying a single summarization job."""
+
+    server: "SummaryServer"
+
+    def handle(self) -> None:
+        try:
+            header = json.loads(recv_frame(self.request))
+            if not isinstance(header, dict):
+                raise ValueError("Summary request header is not a JSON object.")
+            payload = recv_frame(self.request)
+        except ConnectionError:
+            # Also how _claim_socket_path probes for a live service.
+            logging.debug("Client closed the connection before sending a job")
+            return
+        except (ValueError, struct.error):
+            logging.warning("Dropping malformed summary request", exc_info=True)
+            return
+
+        if header.get("config_fingerprint") != self.server.config_fingerprint:
+            response = {
+                "ok": False,
+                "code": ERROR_CONFIG_MISMATCH,
+                "error": "Caller config does not match the config loaded by the service.",
+            }
+        else:
+            response = self.server.run_job(payload)
+
+        try:
+            send_frame(self.request, json.dumps(response).encode("utf-8"))
+        except OSError:
+            logging.warning("Client disconnected before summary was sent", exc_info=True)
+
+
+def _claim_socket_path(socket_path: str) -> None:
+    """Remove a stale socket at ``socket_path``; refuse one a live service owns."""
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+    raise RuntimeError(f"A summary service is already listening on {socket_path}.")
+
+
+class SummaryServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server dispatching jobs to a pre-forked worker pool."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, socket_path: str, config: Dict[str, Iterable], workers: Optional[int] = None
+    ) -> None:
+        _claim_socket_path(socket_path)
+        self.config = config
+        self.config_fingerprint = config_fingerprint(config)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor_lock = threading.Lock()
+        self.executor = self._start_executor()
+        self.socket_path = socket_path
+        super().__init__(socket_path, _JobHandler)
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_FORKSERVER_PRELOAD)
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.config,),
+        )
+        # Workers start on demand; overlapping submissions start all of them now.
+        for future in [executor.submit(_noop) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._executor_lock:
+            if self.executor is broken:
+                logging.warning("Summary worker died; restarting the worker pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._start_executor()
+
+    def run_job(self, payload: bytes) -> Dict[str, Any]:
+        """Run one job on the pool and return the response document."""
+        executor = self.executor
+        try:
+            return {"ok": True, "result": executor.submit(_run_job, payload).result()}
+        except BrokenProcessPool as exc:
+            # A worker was killed (OOM, signal, crash); every in-flight job is lost.
+            self._replace_broken_executor(executor)
+            return {
+                "ok": False,
+                "code": ERROR_WORKER_LOST,
+                "error": f"Summary worker exited unexpectedly: {exc}",
+            }
+        except Exception as exc:  # pylint: disable=broad-except
+            return {
+                "ok": False,
+                "code": ERROR_JOB_FAILED,
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+            }
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def summarize_remote(
+    payload: bytes,
+    socket_path: str,
+    config: Dict[str, Iterable],
+    timeout: float = 120.0,
+) -> summarizer.SummaryResult:
+    """Submit a CSV payload to a running service and return its result.
+
+    ``config`` is the caller's current config; the service refuses the job if
+    it was started with a different one. Anything that prevents the service
+    from handling the job raises ``SummaryServiceUnavailable`` so callers can
+    fall back to summarizing in-process; job failures raise
+    ``SummaryServiceError``.
+    """
+    if len(payload) > MAX_FRAME_BYTES:
+        raise SummaryServiceUnavailable(
+            f"Payload of {len(payload)} bytes exceeds the {MAX_FRAME_BYTES} byte frame limit."
+        )
+
+    header = json.dumps({"config_fingerprint": config_fingerprint(config)})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            send_frame(sock, header.encode("utf-8"))
+            send_frame(sock, payload)
+            response = json.loads(recv_frame(sock))
+        if not isinstance(response, dict):
+            raise ValueError("Summary service response is not a JSON object.")
+    except (OSError, ValueError, struct.error) as exc:
+        raise SummaryServiceUnavailable(
+            f"Summary service at {socket_path} failed: {exc}"
+        ) from exc
+
+    if response.get("ok"):
+        try:
+            return summarizer.SummaryResult(**response["result"])
+        except (KeyError, TypeError) as exc:
+            raise SummaryServiceUnavailable(
+                f"Summary service returned a malformed result: {exc}"
+            ) from exc
+    code = response.get("code")
+    if code in (ERROR_CONFIG_MISMATCH, ERROR_WORKER_LOST):
+        raise SummaryServiceUnavailable(response.get("error", code))
+    raise SummaryServiceError(
+        response.get("error", "Summary service job failed."),
+        response.get("error_type", ""),
+    )
+
+
+def _raise_system_exit(signum: int, _frame: Any) -> None:
+    raise SystemExit(128 + signum)
+
+
+def _load_config(path: Optional[str]) -> Dict[str, Iterable]:
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    raw_config = os.getenv("CONFIG_JSON", "")
+    if not raw_config:
+        raise RuntimeError("Pass --config or set the CONFIG_JSON environment variable.")
+    return json.loads(raw_config)
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Run the summarization service until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--socket",
+        default=os.getenv("SUMMARY_SERVICE_SOCKET", "/tmp/rm-summary.sock"),
+        help="Unix socket path to listen on.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPU count)."
+    )
+    parser.add_argument(
+        "--config", default=None, help="Config JSON file (default: CONFIG_JSON env var)."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = SummaryServer(args.socket, _load_config(args.config), args.workers)
+    logging.info("Summary service listening on %s", args.socket)
+    signal.signal(signal.SIGTERM, _raise_system_exit)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
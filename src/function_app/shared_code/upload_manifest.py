@@ -0,0 +1,111 @@
+"""Writer for the append-only upload manifest read by the uploader web app.
+
+The manifest is a series of JSON-lines append blob segments. This module is
+the single source of the writer: ``scripts/sync_manifest_writer.py`` copies it
+to ``src/webapp/manifest_writer.py`` for the separately deployed web app.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
+from azure.storage.blob import ContainerClient
+
+MANIFEST_BLOB_PREFIX = "uploads"
+# Roll over well before the 50,000-block limit for typical 150-300 byte events.
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+EVENT_UPLOADED = "uploaded"
+EVENT_PROCESSED = "processed"
+EVENT_FAILED = "failed"
+
+_SEGMENT_FULL_ERRORS = {"BlockCountExceedsLimit", "MaxBlobSizeConditionNotMet"}
+_SEGMENT_SEALED_ERROR = "BlobIsSealed"
+_SEGMENT_PATTERN = re.compile(rf"^{MANIFEST_BLOB_PREFIX}-(\d+)\.jsonl$")
+
+
+def segment_name(index: int) -> str:
+    """Return the blob name of manifest segment ``index``."""
+    return f"{MANIFEST_BLOB_PREFIX}-{index:04d}.jsonl"
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    """Serialize an event as a single compact JSON line."""
+    return (json.dumps(event, separators=(",", ":"), sort_keys=True) + "\n").encode(
+        "utf-8"
+    )
+
+
+class ManifestWriter:
+    """Append events to the newest manifest segment, rolling over when full."""
+
+    def __init__(
+        self, container_client: ContainerClient, max_segment_bytes: int = SEGMENT_MAX_BYTES
+    ) -> None:
+        self._container_client = container_client
+        self._max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._segment: Optional[int] = None
+
+    def _newest_segment(self) -> int:
+        """Return the highest existing segment index, or 0 for a new manifest."""
+        indices = [
+            int(match.group(1))
+            for blob in self._container_client.list_blobs(
+                name_starts_with=f"{MANIFEST_BLOB_PREFIX}-"
+            )
+            if (match := _SEGMENT_PATTERN.match(blob.name))
+        ]
+        return max(indices, default=0)
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Append an event, creating or sealing segments as needed."""
+        data = encode_event(event)
+        with self._lock:
+            if self._segment is None:
+                # Start at the newest segment so a fresh process does not
+                # retry every sealed segment before reaching it.
+                self._segment = self._newest_segment()
+            while True:
+                blob_client = self._container_client.get_blob_client(
+                    segment_name(self._segment)
+                )
+                try:
+                    blob_client.append_block(
+                        data, maxsize_condition=self._max_segment_bytes
+                    )
+                    return
+                except ResourceNotFoundError:
+                    self._create_segment(blob_client)
+                except HttpResponseError as exc:
+                    if exc.error_code in _SEGMENT_FULL_ERRORS:
+                        self._seal_segment(blob_client)
+                    elif exc.error_code != _SEGMENT_SEALED_ERROR:
+                        raise
+                    self._segment += 1
+
+    @staticmethod
+    def _create_segment(blob_client: Any) -> None:
+        try:
+            blob_client.create_append_blob(match_condition=MatchConditions.IfMissing)
+        except (ResourceExistsError, ResourceModifiedError):
+            # Another writer created the segment between our two calls.
+            pass
+
+    @staticmethod
+    def _seal_segment(blob_client: Any) -> None:
+        try:
+            blob_client.seal_append_blob()
+        except HttpResponseError as exc:
+            if exc.error_code != _SEGMENT_SEALED_ERROR:
+                raise
@@ -6,6 +6,7 @@ from __future__ import annotations
 import base64
 import datetime as dt
 import json
+import logging
 import os
 import uuid
 
@@ -22,7 +23,7 @@ from flask import (
 from werkzeug.utils import secure_filename
 
 # Third-party imports
-from azure.core.exceptions import AzureError
+from azure.core.exceptions import AzureError, ResourceNotFoundError
 from azure.identity import (
     DefaultAzureCredential,
 )
@@ -31,6 +32,8 @@ from azure.storage.blob import (
     ContentSettings,
 )
 
+import upload_manifest
+
 
 def _allowed_emails() -> set[str]:
     """Return the configured set of authorized uploader email addresses."""
@@ -83,7 +86,44 @@ ALLOWED_EMAILS = _allowed_emails()
 UPLOAD_CONTAINER = os.getenv("UPLOAD_CONTAINER_NAME", "uploads")
 DEBUG_ALLOW_ANON = os.getenv("DEBUG_ALLOW_ANON", "").lower() == "true"
 
+MANIFEST_CONTAINER = os.getenv("MANIFEST_CONTAINER_NAME", "manifests")
+MANIFEST_CACHE_SECONDS = float(os.getenv("MANIFEST_CACHE_SECONDS", "5"))
+HISTORY_PAGE_SIZE = 25
+
 _BLOB_SERVICE = _get_blob_service()
+_MANIFEST_CONTAINER_CLIENT = _BLOB_SERVICE.get_container_client(MANIFEST_CONTAINER)
+_MANIFEST_WRITER = upload_manifest.ManifestWriter(_MANIFEST_CONTAINER_CLIENT)
+_MANIFEST = upload_manifest.ManifestReader(
+    _MANIFEST_CONTAINER_CLIENT, ttl_seconds=MANIFEST_CACHE_SECONDS
+)
+
+
+def _new_blob_name(filename: str) -> str:
+    """Return a unique, sortable blob name for an uploaded export."""
+    return (
+        f"{dt.datetime.now(dt.timezone.utc):%Y%m%d-%H%M%S}-"
+        f"{uuid.uuid4().hex[:8]}-{filename or 'transactions.csv'}"
+    )
+
+
+def _record_upload(
+    blob_name: str, filename: str, size: int, rerun_of: str | None = None
+) -> None:
+    """Append an upload event to the manifest; failures only affect the history view."""
+    event = {
+        "event": upload_manifest.EVENT_UPLOADED,
+        "blob": blob_name,
+        "filename": filename,
+        "size": size,
+        "uploaded_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "uploaded_by": g.get("user_email", ""),
+    }
+    if rerun_of:
+        event["rerun_of"] = rerun_of
+    try:
+        _MANIFEST_WRITER.append(event)
+    except AzureError:
+        logging.warning("Failed to record upload %s in manifest", blob_name, exc_info=True)
 
 
 @app.before_request
@@ -118,10 +158,7 @@ def index():
             flash("Only CSV files exported from Rocket Money are supported.", "error")
             return redirect(url_for("index"))
 
-        blob_name = (
-            f"{dt.datetime.now(dt.timezone.utc):%Y%m%d-%H%M%S}-"
-            f"{uuid.uuid4().hex[:8]}-{filename or 'transactions.csv'}"
-        )
+        blob_name = _new_blob_name(filename)
 
         blob_client = _BLOB_SERVICE.get_blob_client(
             container=UPLOAD_CONTAINER, blob=blob_name
@@ -129,8 +166,9 @@ def index():
 
         try:
             upload.stream.seek(0)
+            data = upload.stream.read()
             blob_client.upload_blob(
-                upload.stream.read(),
+                data,
                 overwrite=False,
                 content_settings=ContentSettings(content_type="text/csv"),
             )
@@ -138,12 +176,74 @@ def index():
             flash(f"Upload failed: {exc}", "error")
             return redirect(url_for("index"))
 
+        _record_upload(blob_name, filename, len(data))
+
         flash("Upload received. Analysis will arrive via email shortly.", "success")
         return redirect(url_for("index"))
 
     return render_template("index.html", user_email=g.get("user_email", ""))
 
 
+@app.get("/history")
+def history():
+    """Render a page of previous uploads and their processing status."""
+    page = request.args.get("page", 1, type=int) or 1
+    page = max(page, 1)
+    try:
+        uploads, total = _MANIFEST.page(page, HISTORY_PAGE_SIZE)
+    except AzureError as exc:
+        flash(f"Could not load upload history: {exc}", "error")
+        uploads, total = [], 0
+
+    page_count = max((total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE, 1)
+    if page > page_count:
+        return redirect(url_for("history", page=page_count))
+
+    return render_template(
+        "history.html",
+        user_email=g.get("user_email", ""),
+        uploads=uploads,
+        page=page,
+        page_count=page_count,
+        total=total,
+    )
+
+
+@app.post("/history/rerun")
+def rerun():
+    """Re-trigger the summary for a past upload by copying it to a new blob."""
+    source_name = request.form.get("blob", "")
+    record = _MANIFEST.get(source_name) if source_name else None
+    if record is None:
+        abort(404)
+
+    filename = record.get("filename") or "transactions.csv"
+    blob_name = _new_blob_name(filename)
+    try:
+        data = (
+            _BLOB_SERVICE.get_blob_client(container=UPLOAD_CONTAINER, blob=source_name)
+            .download_blob()
+            .readall()
+        )
+        _BLOB_SERVICE.get_blob_client(
+            container=UPLOAD_CONTAINER, blob=blob_name
+        ).upload_blob(
+            data,
+            overwrite=False,
+            content_settings=ContentSettings(content_type="text/csv"),
+        )
+    except ResourceNotFoundError:
+        flash("The original upload is no longer available.", "error")
+        return redirect(url_for("history"))
+    except AzureError as exc:
+        flash(f"Re-run failed: {exc}", "error")
+        return redirect(url_for("history"))
+
+    _record_upload(blob_name, filename, len(data), rerun_of=source_name)
+    flash("Summary re-run queued. Analysis will arrive via email shortly.", "success")
+    return redirect(url_for("history"))
+
+
 @app.get("/healthz")
 def healthcheck():
     """Expose a simple health probe endpoint."""
@@ -0,0 +1,159 @@
+"""Append-only upload manifest stored as JSON-lines append blob segments.
+
+Every upload appends an ``uploaded`` event and the blob processor appends a
+``processed`` or ``failed`` event once it finishes. Readers fold the events
+into one record per uploaded blob. Because the blobs are append-only, a reader
+only has to download the bytes written since its previous refresh, so page
+views cost one small range read regardless of how long the history grows.
+
+An append blob holds at most 50,000 blocks, so the manifest is split into
+numbered segments (``uploads-0000.jsonl``, ``uploads-0001.jsonl``, ...). A
+writer that finds the current segment full seals it and moves on to the next;
+sealing guarantees nothing is appended to a segment once its successor exists.
+
+The writer lives in ``manifest_writer``, a generated copy of the function
+app's writer, and is re-exported here next to the reader.
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import json
+import threading
+import time
+from typing import Any, Iterable
+
+# Third-party imports
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import ContainerClient
+
+from manifest_writer import (  # noqa: F401  pylint: disable=unused-import
+    EVENT_FAILED,
+    EVENT_PROCESSED,
+    EVENT_UPLOADED,
+    MANIFEST_BLOB_PREFIX,
+    SEGMENT_MAX_BYTES,
+    ManifestWriter,
+    encode_event,
+    segment_name,
+)
+
+STATUS_PENDING = "pending"
+
+
+def apply_event(
+    records: dict[str, dict[str, Any]], order: list[str], event: dict[str, Any]
+) -> None:
+    """Fold a single manifest event into ``records`` keyed by blob name."""
+    blob_name = event.get("blob")
+    if not blob_name:
+        return
+
+    kind = event.get("event")
+    record = records.get(blob_name)
+    if record is None:
+        record = {"blob": blob_name, "status": STATUS_PENDING}
+        records[blob_name] = record
+        order.append(blob_name)
+
+    if kind == EVENT_UPLOADED:
+        for key, value in event.items():
+            if key != "event":
+                record.setdefault(key, value)
+    elif kind in (EVENT_PROCESSED, EVENT_FAILED):
+        record.update({key: value for key, value in event.items() if key != "event"})
+        record["status"] = kind
+
+
+def fold_events(
+    lines: Iterable[bytes],
+    records: dict[str, dict[str, Any]],
+    order: list[str],
+) -> None:
+    """Decode JSON lines and fold them into ``records``, skipping corrupt lines."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            apply_event(records, order, event)
+
+
+class ManifestReader:
+    """Incrementally cached view over the manifest segments."""
+
+    def __init__(self, container_client: ContainerClient, ttl_seconds: float = 5.0) -> None:
+        self._container_client = container_client
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, Any]] = {}
+        self._order: list[str] = []
+        self._segment = 0
+        self._offset = 0
+        self._partial = b""
+        self._refreshed_at: float | None = None
+
+    def _download(self, segment: int, offset: int) -> bytes | None:
+        """Return bytes of ``segment`` from ``offset``, or None if it does not exist."""
+        blob_client = self._container_client.get_blob_client(segment_name(segment))
+        try:
+            return blob_client.download_blob(offset=offset).readall()
+        except ResourceNotFoundError:
+            return None
+        except HttpResponseError as exc:
+            # 416 means nothing has been appended past ``offset``.
+            if exc.status_code != 416:
+                raise
+            return b""
+
+    def _fold(self, data: bytes) -> None:
+        self._offset += len(data)
+        buffered = self._partial + data
+        complete, _, self._partial = buffered.rpartition(b"\n")
+        fold_events(complete.split(b"\n"), self._records, self._order)
+
+    def refresh(self, force: bool = False) -> None:
+        """Download and fold any bytes appended since the previous refresh."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._refreshed_at is not None
+                and now - self._refreshed_at < self._ttl_seconds
+            ):
+                return
+
+            self._fold(self._download(self._segment, self._offset) or b"")
+            while True:
+                successor = self._download(self._segment + 1, 0)
+                if successor is None:
+                    break
+                # The current segment was sealed before its successor was
+                # created, so this final read of its tail is complete.
+                self._fold(self._download(self._segment, self._offset) or b"")
+                self._segment += 1
+                self._offset = 0
+                self._partial = b""
+                self._fold(successor)
+            self._refreshed_at = now
+
+    def get(self, blob_name: str) -> dict[str, Any] | None:
+        """Return a copy of the record for ``blob_name`` if it is known."""
+        self.refresh()
+        with self._lock:
+            record = self._records.get(blob_name)
+            return dict(record) if record is not None else None
+
+    def page(self, number: int, size: int) -> tuple[list[dict[str, Any]], int]:
+        """Return one page of records, newest first, and the total record count."""
+        self.refresh()
+        with self._lock:
+            total = len(self._order)
+            end = max(total - (number - 1) * size, 0)
+            start = max(end - size, 0)
+            names = reversed(self._order[start:end])
+            return [dict(self._records[name]) for name in names], total
@@ -0,0 +1,133 @@
+"""Tests for the blob-triggered function's summarization fallbacks."""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import annotations
+
+# Standard library imports
+import json
+import socket
+import sys
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Third-party imports
+import pytest
+
+# Make sure the application code is importable when pytest discovers tests
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FUNCTION_APP_DIR = REPO_ROOT / "src" / "function_app"
+if str(FUNCTION_APP_DIR) not in sys.path:
+    sys.path.insert(0, str(FUNCTION_APP_DIR))
+
+import blob_processor  # noqa: E402  pylint: disable=wrong-import-position
+from shared_code import (  # noqa: E402  pylint: disable=wrong-import-position
+    summarizer,
+    summary_service,
+)
+
+CSV_PAYLOAD = b"""\
+Date,Category,Account Number,Amount,Ignored From
+2024-01-01,Groceries,1111,80.0,
+2024-01-02,Groceries,2222,20.0,
+"""
+
+CONFIG = {
+    "Categories": ["Groceries"],
+    "People": [
+        {"Name": "Alice", "Accounts": [1111], "Email": "alice@example.com"},
+        {"Name": "Bob", "Accounts": [2222], "Email": "bob@example.com"},
+    ],
+}
+
+
+@pytest.fixture
+def worker_lost_socket(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[str]:
+    """Serve one job on a socket that answers as if its worker had died."""
+    path = str(tmp_path / "summary.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def _reply() -> None:
+        conn, _ = listener.accept()
+        with conn:
+            summary_service.recv_frame(conn)
+            summary_service.recv_frame(conn)
+            response = {
+                "ok": False,
+                "code": summary_service.ERROR_WORKER_LOST,
+                "error": "Summary worker exited unexpectedly.",
+            }
+            summary_service.send_frame(conn, json.dumps(response).encode("utf-8"))
+
+    thread = threading.Thread(target=_reply, daemon=True)
+    thread.start()
+    monkeypatch.setenv("SUMMARY_SERVICE_SOCKET", path)
+    monkeypatch.setenv("CONFIG_JSON", json.dumps(CONFIG))
+    monkeypatch.setattr(blob_processor, "_CONFIG_CACHE", None)
+    try:
+        yield path
+    finally:
+        thread.join(timeout=5)
+        listener.close()
+
+
+def test_summarize_falls_back_in_process_when_worker_is_lost(
+    worker_lost_socket: str,  # pylint: disable=unused-argument
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A job lost to a dying service worker is summarized in-process instead."""
+    expected = summarizer.summarize(BytesIO(CSV_PAYLOAD), CONFIG)
+
+    result = blob_processor._summarize(CSV_PAYLOAD)  # pylint: disable=protected-access
+
+    assert result == expected
+    assert "summarizing in-process" in caplog.text
+
+
+def test_summarize_reports_job_failures_without_fallback(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Errors in the export itself are raised rather than retried in-process."""
+    calls: List[Dict] = []
+
+    def _fail(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append({"args": args, "kwargs": kwargs})
+        raise summary_service.SummaryServiceError("'Date'", "KeyError")
+
+    monkeypatch.setenv("SUMMARY_SERVICE_SOCKET", "/unused.sock")
+    monkeypatch.setenv("CONFIG_JSON", json.dumps(CONFIG))
+    monkeypatch.setattr(blob_processor, "_CONFIG_CACHE", None)
+    monkeypatch.setattr(summary_service, "summarize_remote", _fail)
+
+    with pytest.raises(summary_service.SummaryServiceError, match="'Date'"):
+        blob_processor._summarize(CSV_PAYLOAD)  # pylint: disable=protected-access
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(("setting", "sharded"), [("", False), ("1", False), ("4", True)])
+def test_summarize_shards_only_when_opted_in(
+    monkeypatch: pytest.MonkeyPatch, setting: str, sharded: bool
+) -> None:
+    """In-process summaries stay serial unless SUMMARY_SHARD_WORKERS is above one."""
+    calls: List[Dict] = []
+
+    def _sharded(payload, config, workers):  # type: ignore[no-untyped-def]
+        calls.append({"workers": workers})
+        return summarizer.summarize(BytesIO(payload), config)
+
+    monkeypatch.delenv("SUMMARY_SERVICE_SOCKET", raising=False)
+    monkeypatch.setenv("SUMMARY_SHARD_WORKERS", setting)
+    monkeypatch.setenv("CONFIG_JSON", json.dumps(CONFIG))
+    monkeypatch.setattr(blob_processor, "_CONFIG_CACHE", None)
+    monkeypatch.setattr(blob_processor.sharding, "summarize_sharded", _sharded)
+
+    result = blob_processor._summarize(CSV_PAYLOAD)  # pylint: disable=protected-access
+
+    assert result == summarizer.summarize(BytesIO(CSV_PAYLOAD), CONFIG)
+    assert calls == ([{"workers": 4}] if sharded else [])
@@ -0,0 +1,152 @@
+"""Tests for sharded summarization of large exports."""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import annotations
+
+# Standard library imports
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Dict, List
+
+# Third-party imports
+import pandas as pd
+import pytest
+
+# Make sure the application code is importable when pytest discovers tests
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FUNCTION_APP_DIR = REPO_ROOT / "src" / "function_app"
+if str(FUNCTION_APP_DIR) not in sys.path:
+    sys.path.insert(0, str(FUNCTION_APP_DIR))
+
+from shared_code import (  # noqa: E402  pylint: disable=wrong-import-position
+    sharding,
+    summarizer,
+)
+
+
+@pytest.fixture
+def sharding_config() -> Dict[str, List]:
+    """Return a configuration with two people and three categories."""
+    return {
+        "Categories": ["Dining & Drinks", "Groceries", "Bills & Utilities"],
+        "People": [
+            {"Name": "Alice", "Accounts": [1111, 3333], "Email": "alice@example.com"},
+            {"Name": "Bob", "Accounts": [2222], "Email": "bob@example.com"},
+        ],
+    }
+
+
+@pytest.fixture
+def export_bytes() -> bytes:
+    """Build a randomized export with quoted commas and newlines in descriptions."""
+    rng = random.Random(42)
+    categories = ["Dining & Drinks", "Groceries", "Bills & Utilities", "Travel"]
+    records = []
+    for index in range(2000):
+        records.append(
+            {
+                "Date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "Description": f'Store {index}, "aisle"\n{rng.randint(1, 9)}',
+                "Category": rng.choice(categories),
+                "Account Number": rng.choice([1111, 2222, 3333, 4444]),
+                "Amount": round(rng.uniform(-50, 500), 2),
+                "Ignored From": rng.choice([None, None, None, "Manual"]),
+            }
+        )
+    buffer = StringIO()
+    pd.DataFrame(records).to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+def test_split_csv_ranges_cover_body_on_record_boundaries(export_bytes: bytes) -> None:
+    """Ranges are contiguous, cover the body, and never split a quoted field."""
+    header, ranges = sharding.split_csv(export_bytes, 7)
+
+    assert export_bytes.startswith(header)
+    assert ranges[0][0] == len(header)
+    assert ranges[-1][1] == len(export_bytes)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    total_rows = 0
+    for start, end in ranges:
+        shard = pd.read_csv(BytesIO(header + export_bytes[start:end]))
+        assert shard["Description"].str.startswith("Store ").all()
+        total_rows += len(shard)
+    assert total_rows == 2000
+
+
+def test_summarize_sharded_matches_serial_result(
+    export_bytes: bytes, sharding_config: Dict[str, List]
+) -> None:
+    """Sharded and serial summaries are identical, including float totals."""
+    expected = summarizer.summarize(BytesIO(export_bytes), sharding_config)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = sharding.summarize_sharded(
+            export_bytes,
+            sharding_config,
+            workers=4,
+            min_shard_bytes=1,
+            executor=executor,
+        )
+
+    assert result == expected
+
+
+def test_summarize_sharded_uses_process_pool(
+    export_bytes: bytes, sharding_config: Dict[str, List]
+) -> None:
+    """The shared forkserver pool produces the serial result and is reused."""
+    expected = summarizer.summarize(BytesIO(export_bytes), sharding_config)
+
+    for _ in range(2):
+        result = sharding.summarize_sharded(
+            export_bytes, sharding_config, workers=2, min_shard_bytes=1
+        )
+        assert result == expected
+
+    executor = sharding._get_executor(2)  # pylint: disable=protected-access
+    assert executor._mp_context.get_start_method() == "forkserver"  # pylint: disable=protected-access
+
+
+def test_summarize_shard_reads_its_range_from_shared_memory(export_bytes: bytes) -> None:
+    """Workers receive offsets into the shared buffer rather than copied shards."""
+    header, ranges = sharding.split_csv(export_bytes, 3)
+    start, end = ranges[1]
+    shared = SharedMemory(create=True, size=len(export_bytes))
+    try:
+        shared.buf[: len(export_bytes)] = export_bytes
+        shard = sharding.summarize_shard(
+            shared.name, len(header), start, end, {"Categories": [], "People": []}, "%Y-%m-%d"
+        )
+    finally:
+        shared.close()
+        shared.unlink()
+
+    assert shard.row_count == len(pd.read_csv(BytesIO(header + export_bytes[start:end])))
+
+
+@pytest.mark.parametrize("column", ["Date", "Amount"])
+def test_summarize_sharded_raises_serial_error_for_missing_columns(
+    export_bytes: bytes, sharding_config: Dict[str, List], column: str
+) -> None:
+    """Malformed exports fail with exactly the serial path's exception."""
+    buffer = StringIO()
+    pd.read_csv(BytesIO(export_bytes)).drop(columns=[column]).to_csv(buffer, index=False)
+    data = buffer.getvalue().encode("utf-8")
+
+    with pytest.raises(Exception) as serial_error:
+        summarizer.summarize(BytesIO(data), sharding_config)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with pytest.raises(Exception) as sharded_error:
+            sharding.summarize_sharded(
+                data, sharding_config, workers=4, min_shard_bytes=1, executor=executor
+            )
+
+    assert type(sharded_error.value) is type(serial_error.value)
+    assert str(sharded_error.value) == str(serial_error.value)
@@ -0,0 +1,255 @@
+"""Tests for the warm summarization service."""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import annotations
+
+# Standard library imports
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Third-party imports
+import pytest
+
+# Make sure the application code is importable when pytest discovers tests
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FUNCTION_APP_DIR = REPO_ROOT / "src" / "function_app"
+if str(FUNCTION_APP_DIR) not in sys.path:
+    sys.path.insert(0, str(FUNCTION_APP_DIR))
+
+from shared_code import (  # noqa: E402  pylint: disable=wrong-import-position
+    summarizer,
+    summary_service,
+)
+
+CSV_PAYLOAD = b"""\
+Date,Category,Account Number,Amount,Ignored From
+2024-01-01,Dining & Drinks,1111,50.0,
+2024-01-02,Dining & Drinks,2222,30.0,
+2024-01-03,Groceries,1111,80.0,
+2024-01-04,Groceries,2222,20.0,
+2024-01-05,Travel,1111,999.0,
+2024-01-06,Dining & Drinks,1111,10.0,Manual
+"""
+
+
+@pytest.fixture
+def service_config() -> Dict[str, List]:
+    """Return a configuration with two people and two categories."""
+    return {
+        "Categories": ["Dining & Drinks", "Groceries"],
+        "People": [
+            {"Name": "Alice", "Accounts": [1111], "Email": "alice@example.com"},
+            {"Name": "Bob", "Accounts": [2222], "Email": "bob@example.com"},
+        ],
+    }
+
+
+HANG_PAYLOAD = b"hang"
+
+_RUN_JOB = summary_service._run_job  # pylint: disable=protected-access
+
+
+def _run_job_or_hang(payload: bytes) -> Dict:
+    """Worker job that blocks on ``HANG_PAYLOAD`` until the worker is killed."""
+    if payload == HANG_PAYLOAD:
+        time.sleep(60)
+    return _RUN_JOB(payload)
+
+
+@pytest.fixture
+def server(
+    tmp_path: Path, service_config: Dict[str, List], monkeypatch: pytest.MonkeyPatch
+) -> Iterator[summary_service.SummaryServer]:
+    """Run a single-worker service on a temporary socket for the test.
+
+    Jobs are dispatched to ``_run_job_or_hang``, which workers import from this
+    module, so a job with ``HANG_PAYLOAD`` blocks until the worker is killed.
+    """
+    monkeypatch.setattr(summary_service, "_run_job", _run_job_or_hang)
+    path = str(tmp_path / "summary.sock")
+    service = summary_service.SummaryServer(path, service_config, workers=1)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield service
+    finally:
+        service.shutdown()
+        service.server_close()
+        thread.join()
+
+
+@pytest.fixture
+def socket_path(server: summary_service.SummaryServer) -> str:
+    """Return the socket path of the running service."""
+    return server.socket_path
+
+
+def test_summarize_remote_matches_in_process_result(
+    socket_path: str, service_config: Dict[str, List]
+) -> None:
+    """The service returns exactly what the in-process summarizer produces."""
+    expected = summarizer.summarize(BytesIO(CSV_PAYLOAD), service_config)
+
+    for _ in range(2):
+        result = summary_service.summarize_remote(CSV_PAYLOAD, socket_path, service_config)
+        assert result == expected
+
+
+def test_summarize_remote_reports_job_failures(
+    socket_path: str, service_config: Dict[str, List]
+) -> None:
+    """Failures inside a worker surface as SummaryServiceError with in-process text."""
+    payload = b"Unexpected,Columns\n1,2\n"
+    with pytest.raises(KeyError) as local_error:
+        summarizer.summarize(BytesIO(payload), service_config)
+
+    with pytest.raises(summary_service.SummaryServiceError) as remote_error:
+        summary_service.summarize_remote(payload, socket_path, service_config)
+
+    assert str(remote_error.value) == str(local_error.value)
+    assert remote_error.value.error_type == "KeyError"
+
+
+def test_malformed_header_is_dropped_without_killing_service(
+    socket_path: str, service_config: Dict[str, List]
+) -> None:
+    """A non-object header closes the connection and later jobs still run."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        summary_service.send_frame(sock, b"[1, 2]")
+        summary_service.send_frame(sock, CSV_PAYLOAD)
+        assert sock.recv(1) == b""
+
+    result = summary_service.summarize_remote(CSV_PAYLOAD, socket_path, service_config)
+    assert result.row_count == 6
+
+
+def test_server_refuses_socket_of_live_service(
+    socket_path: str, service_config: Dict[str, List]
+) -> None:
+    """Starting a second service on a live socket raises instead of stealing it."""
+    with pytest.raises(RuntimeError, match="already listening"):
+        summary_service.SummaryServer(socket_path, service_config, workers=1)
+
+    result = summary_service.summarize_remote(CSV_PAYLOAD, socket_path, service_config)
+    assert result.row_count == 6
+
+
+def test_server_replaces_stale_socket(
+    tmp_path: Path, service_config: Dict[str, List]
+) -> None:
+    """A socket file nobody is listening on is removed and reused."""
+    path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    service = summary_service.SummaryServer(path, service_config, workers=1)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    try:
+        result = summary_service.summarize_remote(CSV_PAYLOAD, path, service_config)
+        assert result.row_count == 6
+    finally:
+        service.shutdown()
+        service.server_close()
+        thread.join()
+
+
+def test_killed_worker_fails_job_fast_and_pool_recovers(
+    server: summary_service.SummaryServer, service_config: Dict[str, List]
+) -> None:
+    """A job whose worker dies is answered promptly and later jobs still run."""
+    errors: List[BaseException] = []
+
+    def _submit_hanging_job() -> None:
+        try:
+            summary_service.summarize_remote(
+                HANG_PAYLOAD, server.socket_path, service_config, timeout=30
+            )
+        except BaseException as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+    client = threading.Thread(target=_submit_hanging_job)
+    client.start()
+    time.sleep(1)
+    started = time.monotonic()
+    for pid in list(server.executor._processes):  # pylint: disable=protected-access
+        os.kill(pid, signal.SIGKILL)
+    client.join(timeout=20)
+
+    assert not client.is_alive()
+    assert time.monotonic() - started < 10
+    assert len(errors) == 1
+    assert isinstance(errors[0], summary_service.SummaryServiceUnavailable)
+    assert "exited unexpectedly" in str(errors[0])
+    result = summary_service.summarize_remote(CSV_PAYLOAD, server.socket_path, service_config)
+    assert result.row_count == 6
+
+
+def test_summarize_remote_rejects_stale_config(
+    socket_path: str, service_config: Dict[str, List]
+) -> None:
+    """A caller whose config differs from the service's is told to fall back."""
+    rotated = {**service_config, "Categories": ["Groceries"]}
+
+    with pytest.raises(summary_service.SummaryServiceUnavailable, match="config"):
+        summary_service.summarize_remote(CSV_PAYLOAD, socket_path, rotated)
+
+
+def test_summarize_remote_rejects_oversized_payload(
+    socket_path: str, service_config: Dict[str, List], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Payloads over the frame limit are refused before anything is sent."""
+    monkeypatch.setattr(summary_service, "MAX_FRAME_BYTES", 16)
+
+    with pytest.raises(summary_service.SummaryServiceUnavailable, match="frame limit"):
+        summary_service.summarize_remote(CSV_PAYLOAD, socket_path, service_config)
+
+
+def test_summarize_remote_wraps_garbled_responses(
+    tmp_path: Path, service_config: Dict[str, List]
+) -> None:
+    """Truncated or non-JSON responses raise SummaryServiceUnavailable."""
+    path = str(tmp_path / "garbled.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def _reply(responses: List[bytes]) -> None:
+        for response in responses:
+            conn, _ = listener.accept()
+            with conn:
+                summary_service.recv_frame(conn)
+                summary_service.recv_frame(conn)
+                conn.sendall(response)
+
+    replies = [b"\x00\x00\x00\x10{", b"\x00\x00\x00\x03abc"]
+    thread = threading.Thread(target=_reply, args=(replies,), daemon=True)
+    thread.start()
+    try:
+        for _ in replies:
+            with pytest.raises(summary_service.SummaryServiceUnavailable):
+                summary_service.summarize_remote(CSV_PAYLOAD, path, service_config, timeout=5)
+    finally:
+        thread.join(timeout=5)
+        listener.close()
+
+
+def test_summarize_remote_raises_unavailable_without_service(
+    tmp_path: Path, service_config: Dict[str, List]
+) -> None:
+    """An absent service raises SummaryServiceUnavailable so callers can fall back."""
+    with pytest.raises(summary_service.SummaryServiceUnavailable):
+        summary_service.summarize_remote(
+            CSV_PAYLOAD, str(tmp_path / "missing.sock"), service_config
+        )
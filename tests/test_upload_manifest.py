@@ -0,0 +1,270 @@
+"""Tests for the upload manifest used by the history page."""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import annotations
+
+# Standard library imports
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Third-party imports
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+# Make sure the web app and function code are importable when pytest discovers tests
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WEBAPP_DIR = REPO_ROOT / "src" / "webapp"
+FUNCTION_APP_DIR = REPO_ROOT / "src" / "function_app"
+for path in (WEBAPP_DIR, FUNCTION_APP_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import upload_manifest  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def _load_sync_script():  # type: ignore[no-untyped-def]
+    spec = importlib.util.spec_from_file_location(
+        "sync_manifest_writer", REPO_ROOT / "scripts" / "sync_manifest_writer.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _storage_error(status_code: int, error_code: str) -> HttpResponseError:
+    error = HttpResponseError(error_code)
+    error.status_code = status_code
+    error.error_code = error_code
+    return error
+
+
+class _Downloader:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def readall(self) -> bytes:
+        return self._data
+
+
+class FakeAppendBlobClient:
+    """In-memory stand-in for an append blob ``BlobClient``."""
+
+    def __init__(self, max_blocks: int) -> None:
+        self.data: bytearray | None = None
+        self.blocks = 0
+        self.sealed = False
+        self.max_blocks = max_blocks
+        self.download_offsets: List[int] = []
+        self.append_calls = 0
+
+    def create_append_blob(self, **_: Any) -> None:
+        if self.data is None:
+            self.data = bytearray()
+
+    def seal_append_blob(self) -> None:
+        self.sealed = True
+
+    def append_block(self, data: bytes, maxsize_condition: int | None = None) -> None:
+        self.append_calls += 1
+        if self.data is None:
+            raise ResourceNotFoundError("BlobNotFound")
+        if self.sealed:
+            raise _storage_error(409, "BlobIsSealed")
+        if self.blocks >= self.max_blocks:
+            raise _storage_error(409, "BlockCountExceedsLimit")
+        if maxsize_condition is not None and len(self.data) + len(data) > maxsize_condition:
+            raise _storage_error(412, "MaxBlobSizeConditionNotMet")
+        self.data.extend(data)
+        self.blocks += 1
+
+    def download_blob(self, offset: int = 0) -> _Downloader:
+        if self.data is None:
+            raise ResourceNotFoundError("BlobNotFound")
+        self.download_offsets.append(offset)
+        if offset >= len(self.data):
+            raise _storage_error(416, "InvalidRange")
+        return _Downloader(bytes(self.data[offset:]))
+
+
+class FakeContainerClient:
+    """In-memory stand-in for a ``ContainerClient`` holding append blobs."""
+
+    def __init__(self, max_blocks: int = 50_000) -> None:
+        self.max_blocks = max_blocks
+        self.blobs: Dict[str, FakeAppendBlobClient] = {}
+
+    def get_blob_client(self, name: str) -> FakeAppendBlobClient:
+        if name not in self.blobs:
+            self.blobs[name] = FakeAppendBlobClient(self.max_blocks)
+        return self.blobs[name]
+
+    def list_blobs(self, name_starts_with: str = "") -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(name=name)
+            for name in self.segments()
+            if name.startswith(name_starts_with)
+        ]
+
+    def segments(self) -> Dict[str, FakeAppendBlobClient]:
+        return {name: blob for name, blob in self.blobs.items() if blob.data is not None}
+
+
+def _uploaded(blob: str, **extra: Any) -> Dict[str, Any]:
+    return {"event": upload_manifest.EVENT_UPLOADED, "blob": blob, **extra}
+
+
+@pytest.fixture
+def container() -> FakeContainerClient:
+    """Return an empty fake manifest container."""
+    return FakeContainerClient()
+
+
+def test_writer_creates_segment_and_writes_json_lines(
+    container: FakeContainerClient,
+) -> None:
+    """The first append creates segment zero; every event is a single JSON line."""
+    writer = upload_manifest.ManifestWriter(container)
+    writer.append(_uploaded("a.csv"))
+    writer.append(_uploaded("b.csv"))
+
+    segment = container.segments()[upload_manifest.segment_name(0)]
+    lines = bytes(segment.data or b"").splitlines()
+    assert len(lines) == 2
+    assert b'"blob":"a.csv"' in lines[0]
+
+
+def test_writer_rolls_over_on_block_count_and_size() -> None:
+    """Full segments are sealed and writing continues in the next segment."""
+    container = FakeContainerClient(max_blocks=3)
+    writer = upload_manifest.ManifestWriter(container, max_segment_bytes=200)
+    for index in range(10):
+        writer.append(_uploaded(f"{index}.csv"))
+
+    segments = container.segments()
+    assert len(segments) > 3
+    assert all(blob.blocks <= 3 and len(blob.data or b"") <= 200 for blob in segments.values())
+    last = upload_manifest.segment_name(len(segments) - 1)
+    assert all(blob.sealed for name, blob in segments.items() if name != last)
+
+
+def test_writer_skips_segments_sealed_by_other_writers() -> None:
+    """A writer with a stale segment index moves past sealed segments."""
+    container = FakeContainerClient(max_blocks=2)
+    first = upload_manifest.ManifestWriter(container)
+    second = upload_manifest.ManifestWriter(container)
+    for index in range(5):
+        first.append(_uploaded(f"{index}.csv"))
+
+    second.append(_uploaded("late.csv"))
+
+    reader = upload_manifest.ManifestReader(container, ttl_seconds=0)
+    records, total = reader.page(1, 10)
+    assert total == 6
+    assert records[0]["blob"] == "late.csv"
+
+
+def test_new_writer_starts_at_newest_segment() -> None:
+    """A fresh process appends to the newest segment without probing sealed ones."""
+    container = FakeContainerClient(max_blocks=2)
+    first = upload_manifest.ManifestWriter(container)
+    for index in range(7):
+        first.append(_uploaded(f"{index}.csv"))
+    newest = upload_manifest.segment_name(len(container.segments()) - 1)
+    calls_before = {name: blob.append_calls for name, blob in container.segments().items()}
+
+    upload_manifest.ManifestWriter(container).append(_uploaded("fresh.csv"))
+
+    for name, blob in container.segments().items():
+        expected_calls = calls_before[name] + (1 if name == newest else 0)
+        assert blob.append_calls == expected_calls
+
+
+def test_webapp_manifest_writer_is_generated_from_function_source() -> None:
+    """The web app's writer is an unmodified copy of the function app's writer."""
+    sync_script = _load_sync_script()
+
+    assert sync_script.OUTPUT_FILE.read_text() == sync_script.render_manifest_writer(), (
+        "src/webapp/manifest_writer.py is stale; run scripts/sync_manifest_writer.py"
+    )
+
+
+def test_fold_events_merges_status_into_upload_record() -> None:
+    """Processing events update the record created by the upload event."""
+    records: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+    events = [
+        upload_manifest.encode_event(_uploaded("a.csv", filename="a.csv", size=10)),
+        b"not json",
+        upload_manifest.encode_event(
+            {
+                "event": upload_manifest.EVENT_PROCESSED,
+                "blob": "a.csv",
+                "row_count": 6,
+                "totals": {"Alice": 130.0, "Bob": 50.0},
+            }
+        ),
+    ]
+
+    upload_manifest.fold_events(events, records, order)
+
+    assert order == ["a.csv"]
+    assert records["a.csv"]["status"] == upload_manifest.EVENT_PROCESSED
+    assert records["a.csv"]["row_count"] == 6
+    assert records["a.csv"]["filename"] == "a.csv"
+
+
+def test_reader_pages_newest_first_and_reads_incrementally(
+    container: FakeContainerClient,
+) -> None:
+    """Pages are newest first and refreshes only download appended bytes."""
+    writer = upload_manifest.ManifestWriter(container)
+    for index in range(5):
+        writer.append(_uploaded(f"{index}.csv"))
+    reader = upload_manifest.ManifestReader(container, ttl_seconds=0)
+
+    first_page, total = reader.page(1, 2)
+    last_page, _ = reader.page(3, 2)
+    assert total == 5
+    assert [record["blob"] for record in first_page] == ["4.csv", "3.csv"]
+    assert [record["blob"] for record in last_page] == ["0.csv"]
+    assert reader.page(4, 2) == ([], 5)
+
+    segment = container.segments()[upload_manifest.segment_name(0)]
+    size_before = len(segment.data or b"")
+    writer.append({"event": upload_manifest.EVENT_FAILED, "blob": "4.csv", "error": "boom"})
+    record = reader.get("4.csv")
+
+    assert record is not None
+    assert record["status"] == upload_manifest.EVENT_FAILED
+    assert size_before in segment.download_offsets
+
+
+def test_reader_follows_segments_across_rollover() -> None:
+    """Events appended before and after a rollover are all folded, in order."""
+    container = FakeContainerClient(max_blocks=3)
+    writer = upload_manifest.ManifestWriter(container)
+    reader = upload_manifest.ManifestReader(container, ttl_seconds=0)
+    writer.append(_uploaded("0.csv"))
+    assert reader.page(1, 10)[1] == 1
+
+    for index in range(1, 8):
+        writer.append(_uploaded(f"{index}.csv"))
+    writer.append({"event": upload_manifest.EVENT_PROCESSED, "blob": "0.csv", "row_count": 3})
+    records, total = reader.page(1, 10)
+
+    assert len(container.segments()) == 3
+    assert total == 8
+    assert [record["blob"] for record in records] == [f"{i}.csv" for i in range(7, -1, -1)]
+    assert records[-1]["status"] == upload_manifest.EVENT_PROCESSED
+
+
+def test_reader_handles_missing_manifest(container: FakeContainerClient) -> None:
+    """A manifest that does not exist yet renders as an empty history."""
+    reader = upload_manifest.ManifestReader(container, ttl_seconds=0)
+
+    assert reader.page(1, 25) == ([], 0)
+    assert reader.get("missing.csv") is None